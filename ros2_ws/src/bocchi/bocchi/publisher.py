@@ -19,6 +19,9 @@ from typing import Optional
 
 minimal_publisher = None
 
+# Upper bound for the key_press hold time a client may request
+MAX_KEY_PRESS_HOLD_MS = 1000
+
 def signal_handler(sig, frame):
     print("\nSIGINT (Ctrl+C) received! Performing graceful shutdown.")
     if minimal_publisher:
@@ -848,6 +851,13 @@ class MinimalPublisher(Node):
                 self.api_handler.websocket_manager.stats['messages_received'] += 1
             self.handle_socketio_key_up(sid, data)
 
+        @self.sio.on('key_press')
+        def key_press(sid, data):
+            """Handle key tap (down + up) event"""
+            if self.api_handler:
+                self.api_handler.websocket_manager.stats['messages_received'] += 1
+            self.handle_socketio_key_press(sid, data)
+
         @self.sio.on('get_status')
         def get_status(sid, data):
             """Handle status request"""
@@ -1070,6 +1080,84 @@ class MinimalPublisher(Node):
 
 
 
+    def handle_socketio_key_press(self, sid, data):
+        """Handle a key tap received via WebSocket
+
+        Equivalent to a key_down followed by a key_up after hold_ms
+        milliseconds, but sent by the client as a single event. hold_ms is
+        clamped to 0..MAX_KEY_PRESS_HOLD_MS; non-numeric values count as 0.
+        """
+        try:
+            key = data.get('key', '')
+            key_code = data.get('key_code', 0)
+            try:
+                hold_ms = float(data.get('hold_ms', 0))
+            except (TypeError, ValueError):
+                hold_ms = 0
+            if not 0 <= hold_ms <= MAX_KEY_PRESS_HOLD_MS:
+                # Also rejects NaN
+                hold_ms = MAX_KEY_PRESS_HOLD_MS if hold_ms > 0 else 0
+            timestamp = data.get('timestamp', int(time.time() * 1000))
+            request_id = data.get('request_id')
+
+            api_handler = self.api_handler or (self.flask_app.config.get('api_handler') if self.flask_app else None)
+            if not api_handler:
+                raise Exception("API handler not available")
+
+            # Press
+            published_down = api_handler.key_state_manager.update_key(key_code, True)
+            if published_down:
+                self.process_key_input(key, key_code)
+
+            if hold_ms > 0:
+                self.sio.sleep(hold_ms / 1000.0)
+
+            # Release
+            published_up = api_handler.key_state_manager.update_key(key_code, False)
+            if published_up:
+                self.process_key_release(key, key_code)
+
+            response_data = {
+                'type': 'key_press_response',
+                'success': True,
+                'key': key,
+                'key_code': key_code,
+                'hold_ms': hold_ms,
+                'timestamp': timestamp,
+                'published': published_down or published_up
+            }
+
+            if request_id:
+                response_data['request_id'] = request_id
+
+            if published_down or published_up:
+                # Broadcast key press event
+                event_data = {
+                    'type': 'key_press_event',
+                    'key': key,
+                    'key_code': key_code,
+                    'hold_ms': hold_ms,
+                    'timestamp': timestamp
+                }
+                api_handler.broadcast_event(event_data)
+
+                print(f"SocketIO key press: {key} ({key_code})")
+
+            # Send response back to requesting client
+            self.sio.emit('key_press_response', response_data, to=sid)
+
+        except Exception as e:
+            error_response = {
+                'type': 'key_press_response',
+                'success': False,
+                'error': str(e),
+                'timestamp': int(time.time() * 1000)
+            }
+            if data.get('request_id'):
+                error_response['request_id'] = data.get('request_id')
+            self.sio.emit('key_press_response', error_response, to=sid)
+            print(f"Error handling SocketIO key press: {e}")
+
     def handle_socketio_status_request(self, sid, data):
         """Enhanced status request handler with detailed WebSocket statistics"""
         try:
@@ -7,17 +7,125 @@ and sending various events to verify functionality.
 """
 
 import socketio
+import asyncio
 import time
 import json
 import argparse
+import atexit
+import contextlib
+import itertools
+import os
+import shlex
+import socket
+import string
 import sys
+import tempfile
+from time import time as _now
+
+try:
+    import orjson
+
+    class _OrjsonModule:
+        """json-compatible shim so Socket.IO packets are encoded by orjson"""
+
+        @staticmethod
+        def dumps(obj, *args, **kwargs):
+            # socketio passes separators=...; orjson output is already compact
+            return orjson.dumps(obj).decode()
+
+        loads = staticmethod(orjson.loads)
+
+    _json_module = _OrjsonModule
+except ImportError:
+    _json_module = json
+
+# Key codes for the letters, computed once instead of per emitted key
+_KEYCODES = {c: ord(c.upper()) for c in string.ascii_letters}
+
+# Keys exercised by the comprehensive test
+DEFAULT_KEYS = [('w', 87), ('a', 65), ('s', 83), ('d', 68), ('f', 70), ('l', 76)]
+
+def _ms():
+    """Current wall-clock time in milliseconds"""
+    return int(_now() * 1000)
+
+async def _read_stdin(loop, fd):
+    """Wait on the event loop until stdin is readable, then read what is there"""
+    readable = loop.create_future()
+    try:
+        loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+    except PermissionError:
+        # Regular files cannot be polled but never block either
+        return os.read(fd, 4096)
+    try:
+        await readable
+    finally:
+        loop.remove_reader(fd)
+    return os.read(fd, 4096)
+
+_stdin_pending = bytearray()
+
+async def _read_line(prompt):
+    """Read a line from stdin without blocking the event loop
+    
+    stdin is polled by the loop itself instead of a thread blocked in
+    input(), so nothing is left holding stdin when the session ends or is
+    interrupted. Returns None at end of input.
+    """
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+    while b'\n' not in _stdin_pending:
+        chunk = await _read_stdin(loop, fd)
+        if not chunk:
+            if not _stdin_pending:
+                return None
+            break
+        _stdin_pending.extend(chunk)
+    
+    line, sep, rest = bytes(_stdin_pending).partition(b'\n')
+    _stdin_pending[:] = rest
+    return line.decode(errors='replace')
 
 class SocketIOTestClient:
-    def __init__(self, server_url='http://localhost:8080'):
+    def __init__(self, server_url='http://localhost:8080', sndbuf=0,
+                 legacy_serial=False, pace=0, quiet=False, wait_for_response=False):
         self.server_url = server_url
-        self.sio = socketio.Client()
+        # Fixed SO_SNDBUF/SO_RCVBUF in bytes. 0 leaves them to the kernel:
+        # setting them disables TCP autotuning and is capped at rmem/wmem_max.
+        self.sndbuf = sndbuf
+        # Send the comprehensive test's keys one by one instead of pipelined
+        self.legacy_serial = legacy_serial
+        # Optional delay in seconds between comprehensive test steps, for humans
+        self.pace = pace
+        # Skip the per-response log lines
+        self.quiet = quiet
+        # Make send_ping/send_key wait for their pong/response
+        self.wait_for_response = wait_for_response
+        # handle_sigint=False leaves Ctrl-C to asyncio.run, which cancels
+        # run() so it can disconnect cleanly.
+        self.sio = socketio.AsyncClient(json=_json_module, handle_sigint=False)
         self.connected = False
-        self.responses = {}
+        
+        # Resolved by the event handlers so callers can await without polling.
+        # Responses are handed straight to the waiting caller and never stored,
+        # so fire-and-forget emits leave nothing behind.
+        self._connect_evt = asyncio.Event()
+        self._futures = {}
+        self._pong_fut = None
+        # Request IDs must be unique per session; wall-clock ms collide in bursts
+        self._rid = itertools.count(1).__next__
+        
+        # Payload templates built once; only timestamp/request_id change per
+        # emit. Safe to reuse because emit encodes the packet before yielding.
+        self._key_payloads = {k: {'key': k, 'key_code': c, 'timestamp': 0}
+                              for k, c in DEFAULT_KEYS}
+        self._batch_payload = {
+            'keys_input': 'w a s d f l',
+            'timestamp': 0,
+            'request_id': 0
+        }
         
         # Setup event handlers
         self.setup_event_handlers()
@@ -29,11 +137,14 @@ class SocketIOTestClient:
         def connect():
             print(f"✓ Connected to Socket.IO server at {self.server_url}")
             self.connected = True
+            self._tune_socket()
+            self._connect_evt.set()
         
         @self.sio.event
         def disconnect():
             print("✗ Disconnected from Socket.IO server")
             self.connected = False
+            self._connect_evt.clear()
         
         @self.sio.event
         def connect_error(data):
@@ -50,46 +161,73 @@ class SocketIOTestClient:
         @self.sio.event
         def pong(data):
             print(f"Pong received: {data}")
+            if self._pong_fut and not self._pong_fut.done():
+                self._pong_fut.set_result(data)
         
-        # Response handlers
-        response_events = [
-            'test_connection_response',
-            'status_response', 
-            'keyboard_response',
-            'key_down_response',
-            'key_up_response',
-            'send_key_response',
-            'send_key_batch_response'
-        ]
-        
-        for event in response_events:
-            self.sio.on(event, self.handle_response)
+        # All *_response events go through one catch-all handler
+        self.sio.on('*', self._any)
+    
+    def _any(self, event, *args):
+        """Catch-all for events without a dedicated handler
+        
+        Server events may carry any number of arguments; only *_response
+        events with a payload are handled, everything else is ignored.
+        """
+        if event.endswith('_response') and args:
+            self.handle_response(args[0])
+    
+    def _tune_socket(self):
+        """Apply buffer sizes and TCP_NODELAY to the current connection"""
+        ws = getattr(self.sio.eio, 'ws', None)
+        # Payloads are tiny, so per-message deflate only costs CPU and latency.
+        # aiohttp's ws_connect doesn't offer it by default; make sure it stays so.
+        if getattr(ws, 'compress', 0):
+            print("Warning: WebSocket negotiated permessage-deflate")
+        
+        sock = ws.get_extra_info('socket') if ws is not None else None
+        if sock is None:
+            return
+        try:
+            if self.sndbuf:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.sndbuf)
+            # Key events are tiny; don't let Nagle hold them back
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as e:
+            print(f"Warning: could not tune socket options: {e}")
     
     def handle_response(self, data):
         """Handle response events"""
-        event_type = data.get('type', 'unknown')
         request_id = data.get('request_id')
         
-        if request_id:
-            self.responses[request_id] = data
+        if request_id is not None:
+            # Wake up the caller waiting on this request, if any
+            fut = self._futures.pop(request_id, None)
+            if fut and not fut.done():
+                fut.set_result(data)
+        
+        if self.quiet:
+            return
         
-        print(f"Response received - Type: {event_type}, Success: {data.get('success', False)}")
-        if not data.get('success', False):
+        success = data.get('success', False)
+        print(f"Response received - Type: {data.get('type', 'unknown')}, Success: {success}")
+        if not success:
             print(f"  Error: {data.get('error', 'Unknown error')}")
     
-    def connect_to_server(self):
+    async def connect_to_server(self):
         """Connect to the Socket.IO server"""
         try:
             print(f"Connecting to Socket.IO server at {self.server_url}...")
-            self.sio.connect(self.server_url)
+            # Go straight to WebSocket instead of polling + upgrade. The server
+            # must accept the websocket transport (eventlet WSGI server does).
+            await self.sio.connect(self.server_url, transports=['websocket'],
+                                   socketio_path='socket.io')
             
             # Wait for connection
             timeout = 10
-            start_time = time.time()
-            while not self.connected and (time.time() - start_time) < timeout:
-                time.sleep(0.1)
-            
-            if not self.connected:
+            try:
+                await asyncio.wait_for(self._connect_evt.wait(), timeout)
+            except asyncio.TimeoutError:
                 print("✗ Failed to connect within timeout")
                 return False
             
@@ -99,62 +237,91 @@ class SocketIOTestClient:
             print(f"✗ Connection failed: {e}")
             return False
     
-    def disconnect_from_server(self):
+    async def disconnect_from_server(self):
         """Disconnect from the Socket.IO server"""
         if self.connected:
-            self.sio.disconnect()
+            # Fire-and-forget emits only queue their packets; give engine.io's
+            # write loop the chance to send them before the socket is closed
+            try:
+                await asyncio.wait_for(self.sio.eio.queue.join(), 5)
+            except asyncio.TimeoutError:
+                print("Warning: some queued events were not sent before disconnecting")
+            await self.sio.disconnect()
             print("Disconnected from server")
+        sys.stdout.flush()
+    
+    async def _emit_and_wait(self, event, payload, timeout=5):
+        """Emit an event and await the response matching its request_id
+        
+        Returns the response data, or None if nothing arrived within timeout.
+        """
+        request_id = payload['request_id']
+        fut = asyncio.get_running_loop().create_future()
+        self._futures[request_id] = fut
+        try:
+            await self.sio.emit(event, payload)
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._futures.pop(request_id, None)
     
-    def send_ping(self):
-        """Send a ping event"""
+    async def send_ping(self, timeout=5, wait=None):
+        """Send a ping event, optionally waiting for the pong
+        
+        wait defaults to wait_for_response.
+        """
         print("Sending ping...")
-        self.sio.emit('ping', {'timestamp': int(time.time() * 1000)})
-        time.sleep(0.5)
+        if not (self.wait_for_response if wait is None else wait):
+            await self.sio.emit('ping', {'timestamp': _ms()})
+            return True
+        
+        self._pong_fut = asyncio.get_running_loop().create_future()
+        try:
+            await self.sio.emit('ping', {'timestamp': _ms()})
+            await asyncio.wait_for(self._pong_fut, timeout)
+            return True
+        except asyncio.TimeoutError:
+            print("✗ Ping failed - No pong")
+            return False
+        finally:
+            self._pong_fut = None
     
-    def test_connection(self):
+    async def test_connection(self):
         """Test connection with latency measurement"""
         print("Testing connection...")
-        request_id = int(time.time() * 1000)
-        start_time = time.time()
+        ts = _ms()
+        request_id = self._rid()
+        start_ns = time.perf_counter_ns()
         
-        self.sio.emit('test_connection', {
-            'timestamp': int(time.time() * 1000),
+        response = await self._emit_and_wait('test_connection', {
+            'timestamp': ts,
             'request_id': request_id
         })
         
-        # Wait for response
-        timeout = 5
-        while request_id not in self.responses and (time.time() - start_time) < timeout:
-            time.sleep(0.1)
-        
-        if request_id in self.responses:
-            response = self.responses[request_id]
-            latency = (time.time() - start_time) * 1000
-            print(f"✓ Connection test successful - Latency: {latency:.2f}ms")
+        if response is not None:
+            latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            print(f"✓ Connection test successful - Latency: {latency_ms:.2f}ms")
             return True
         else:
             print("✗ Connection test failed - No response")
             return False
     
-    def get_status(self):
+    async def get_status(self):
         """Get server status"""
         print("Requesting server status...")
-        request_id = int(time.time() * 1000)
-        start_time = time.time()
+        ts = _ms()
+        request_id = self._rid()
+        start_ns = time.perf_counter_ns()
         
-        self.sio.emit('get_status', {
-            'timestamp': int(time.time() * 1000),
+        response = await self._emit_and_wait('get_status', {
+            'timestamp': ts,
             'request_id': request_id
         })
         
-        # Wait for response
-        timeout = 5
-        while request_id not in self.responses and (time.time() - start_time) < timeout:
-            time.sleep(0.1)
-        
-        if request_id in self.responses:
-            response = self.responses[request_id]
-            print(f"✓ Server status received:")
+        if response is not None:
+            latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            print(f"✓ Server status received - Latency: {latency_ms:.2f}ms")
             print(f"  Running: {response.get('server_running', 'Unknown')}")
             print(f"  Connected clients: {response.get('connected_clients', 'Unknown')}")
             print(f"  Uptime: {response.get('uptime', 'Unknown')} seconds")
@@ -163,178 +330,529 @@ class SocketIOTestClient:
             print("✗ Status request failed - No response")
             return False
     
-    def send_key(self, key, key_code):
+    def _key_payload(self, key, key_code, ts):
+        """Return a send_key payload, reusing the prebuilt template if any"""
+        payload = self._key_payloads.get(key)
+        if payload is None or payload['key_code'] != key_code:
+            payload = {'key': key, 'key_code': key_code, 'timestamp': 0}
+        payload['timestamp'] = ts
+        return payload
+    
+    async def send_key(self, key, key_code):
         """Send a key event"""
         print(f"Sending key: {key} (code: {key_code})")
         
-        self.sio.emit('send_key', {
-            'key': key,
-            'key_code': key_code,
-            'timestamp': int(time.time() * 1000)
-        })
-        time.sleep(0.2)
+        payload = self._key_payload(key, key_code, _ms())
+        if not self.wait_for_response:
+            await self.sio.emit('send_key', payload)
+            return True
+        
+        # Copy so the shared template never carries a stale request_id
+        response = await self._emit_and_wait('send_key', dict(payload, request_id=self._rid()))
+        if response is None:
+            print("✗ Key send failed - No response")
+            return False
+        return response.get('success', False)
+    
+    def _key_press_payload(self, key, hold_ms=0):
+        """Build a key_press payload for a single character"""
+        return {
+            'key': key.lower(),
+            'key_code': _KEYCODES.get(key) or ord(key.upper()),
+            'hold_ms': hold_ms,
+            'timestamp': _ms()
+        }
     
-    def send_key_sequence(self, keys):
-        """Send a sequence of key down/up events"""
+    async def send_key_press(self, key, hold_ms=0):
+        """Send a key tap as a single key_press event instead of key_down/key_up"""
+        print(f"Sending key press: {key}")
+        await self.sio.emit('key_press', self._key_press_payload(key, hold_ms))
+    
+    async def send_keys_pipelined(self, pairs):
+        """Send several (key, key_code) events at once without waiting in between"""
+        print(f"Sending keys pipelined: {' '.join(key for key, _ in pairs)}")
+        ts = _ms()
+        await asyncio.gather(*(self.sio.emit('send_key', self._key_payload(key, code, ts))
+                               for key, code in pairs))
+    
+    async def send_key_sequence(self, keys):
+        """Send a sequence of key taps as pipelined key_press events
+        
+        The server presses and releases each key within one key_press
+        event, so the robot is stopped again once the sequence is done.
+        All taps are emitted at once and their responses awaited together.
+        """
         print(f"Sending key sequence: {keys}")
         
+        payloads = []
         for key in keys:
-            key_code = ord(key.upper())
+            payload = self._key_press_payload(key)
+            payload['request_id'] = self._rid()
+            payloads.append(payload)
+        responses = await asyncio.gather(*(self._emit_and_wait('key_press', payload)
+                                           for payload in payloads))
+        
+        failed = [p['key'] for p, r in zip(payloads, responses)
+                  if r is None or not r.get('success', False)]
+        if failed:
+            print(f"✗ Key sequence failed for: {' '.join(failed)}")
+            return False
+        
+        print(f"✓ Key sequence processed - {len(keys)} keys")
+        return True
+    
+    async def send_key_sequence_legacy(self, keys):
+        """Send a sequence of key down/up events, one pair per key"""
+        print(f"Sending key sequence (legacy): {keys}")
+        
+        for key in keys:
+            key_code = _KEYCODES.get(key) or ord(key.upper())
             
             # Key down
-            self.sio.emit('key_down', {
+            await self.sio.emit('key_down', {
                 'key': key.lower(),
                 'key_code': key_code,
-                'timestamp': int(time.time() * 1000)
+                'timestamp': _ms()
             })
-            time.sleep(0.1)
+            await asyncio.sleep(0.1)
             
             # Key up
-            self.sio.emit('key_up', {
+            await self.sio.emit('key_up', {
                 'key': key.lower(),
-                'timestamp': int(time.time() * 1000)
+                'timestamp': _ms()
             })
-            time.sleep(0.1)
+            await asyncio.sleep(0.1)
+    
+    async def _pace(self):
+        """Pause between comprehensive test steps when a pace is configured"""
+        if self.pace > 0:
+            await asyncio.sleep(self.pace)
     
-    def run_comprehensive_test(self):
+    async def run_comprehensive_test(self):
         """Run a comprehensive test suite"""
         print("=" * 60)
         print("Socket.IO Comprehensive Test Suite")
         print("=" * 60)
         
-        # Connect
-        if not self.connect_to_server():
+        # Connect, unless running on a session that is already open
+        owns_connection = not self.connected
+        if owns_connection and not await self.connect_to_server():
             print("✗ Failed to connect to server")
             return False
         
-        time.sleep(1)
+        await self._pace()
         
         # Test connection
         print("\n1. Testing connection...")
-        if not self.test_connection():
+        if not await self.test_connection():
             print("✗ Connection test failed")
         
-        time.sleep(1)
+        await self._pace()
         
         # Get status
         print("\n2. Getting server status...")
-        if not self.get_status():
+        if not await self.get_status():
             print("✗ Status request failed")
         
-        time.sleep(1)
+        await self._pace()
         
         # Send ping
         print("\n3. Sending ping...")
-        self.send_ping()
+        await self.send_ping()
         
-        time.sleep(1)
+        await self._pace()
         
         # Send individual keys
         print("\n4. Testing individual key sending...")
-        test_keys = [('w', 87), ('a', 65), ('s', 83), ('d', 68), ('f', 70), ('l', 76)]
-        for key, code in test_keys:
-            self.send_key(key, code)
+        if self.legacy_serial:
+            for key, code in DEFAULT_KEYS:
+                await self.send_key(key, code)
+        else:
+            await self.send_keys_pipelined(DEFAULT_KEYS)
         
-        time.sleep(1)
+        await self._pace()
         
         # Send key sequence
         print("\n5. Testing key sequence...")
-        self.send_key_sequence("wasd")
+        await self.send_key_sequence("wasd")
         
-        time.sleep(1)
+        await self._pace()
         
         # Test batch send
         print("\n6. Testing batch key send...")
-        request_id = int(time.time() * 1000)
-        self.sio.emit('send_key_batch', {
-            'keys_input': 'w a s d f l',
-            'timestamp': int(time.time() * 1000),
-            'request_id': request_id
-        })
-        
-        time.sleep(2)
+        ts = _ms()
+        payload = self._batch_payload
+        payload['timestamp'] = ts
+        payload['request_id'] = self._rid()
+        if await self._emit_and_wait('send_key_batch', payload) is None:
+            print("✗ Batch key send failed - No response")
         
         print("\n✓ Comprehensive test completed")
         
         # Disconnect
-        self.disconnect_from_server()
+        if owns_connection:
+            await self.disconnect_from_server()
         return True
 
-def main():
-    parser = argparse.ArgumentParser(description='Socket.IO Test Client for bocchi robot controller')
-    parser.add_argument('--url', default='http://localhost:8080', 
-                       help='Socket.IO server URL (default: http://localhost:8080)')
-    parser.add_argument('--test', choices=['ping', 'connection', 'status', 'keys', 'comprehensive'],
-                       default='comprehensive', help='Test type to run')
-    parser.add_argument('--interactive', action='store_true',
-                       help='Run in interactive mode')
+def _one_key(send):
+    """Wrap send(client, key) as a handler taking exactly one single-character key"""
+    def handler(client, args):
+        if len(args) != 1 or len(args[0]) != 1:
+            return None
+        return send(client, args[0])
+    return handler
+
+# Interactive commands: name -> handler(client, args) returning a coroutine,
+# or None when the arguments don't fit, in which case the usage is printed.
+HANDLERS = {
+    'connect': lambda c, a: c.connect_to_server(),
+    'disconnect': lambda c, a: c.disconnect_from_server(),
+    'ping': lambda c, a: c.send_ping(),
+    'test': lambda c, a: c.test_connection(),
+    'status': lambda c, a: c.get_status(),
+    'key': _one_key(lambda c, k: c.send_key(k.lower(), ord(k.upper()))),
+    'press': _one_key(lambda c, k: c.send_key_press(k)),
+    'sequence': lambda c, a: c.send_key_sequence(a[0]) if len(a) == 1 and a[0] else None,
+}
+
+COMMANDS_HELP = ("connect, disconnect, ping, test, status, key <key>, press <key>, "
+                 "sequence <keys>, quit")
+
+# Client options a --via-daemon caller passes along with each test
+DAEMON_OPTIONS = ('legacy_serial', 'pace', 'quiet', 'wait_for_response')
+
+# Tests selectable with --test: name -> test(client) returning a coroutine
+TESTS = {
+    # Passing means the server answered, whatever --wait-for-response says
+    'ping': lambda c: c.send_ping(wait=True),
+    'connection': lambda c: c.test_connection(),
+    'status': lambda c: c.get_status(),
+    'keys': lambda c: c.send_key_sequence("wasd"),
+    'comprehensive': lambda c: c.run_comprehensive_test(),
+}
+
+async def run_test(client, name):
+    """Run a single named test on a connected client, returning success
     
-    args = parser.parse_args()
+    The test's wall-clock duration is printed so runs can be compared.
+    """
+    test = TESTS.get(name)
+    if test is None:
+        print(f"Unknown test: {name}")
+        return False
     
-    client = SocketIOTestClient(args.url)
+    start_ns = time.perf_counter_ns()
+    ok = await test(client)
+    print(f"{name}: {(time.perf_counter_ns() - start_ns) / 1e6:.2f} ms")
+    return ok
+
+def _default_ipc_path():
+    """Per-user path of the daemon socket, under $XDG_RUNTIME_DIR when set"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if not runtime_dir:
+        runtime_dir = os.path.join(tempfile.gettempdir(), f'bocchi-{os.getuid()}')
+    return os.path.join(runtime_dir, 'bocchi_socketio_client.sock')
+
+def _check_ipc_dir(path, create=False):
+    """Return an error message if other users could bind or reach path
+    
+    The socket's directory must belong to the current user and be closed to
+    everyone else, otherwise another local user could pose as the daemon.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if create:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    try:
+        st = os.stat(directory)
+    except FileNotFoundError:
+        return None
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        return f"{directory} must be owned by the current user and not accessible to others"
+    return None
+
+def _remove_ipc_socket(path):
+    """Remove the daemon's Unix socket file if it is still present"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+async def _daemon_listening(path):
+    """Return True if something accepts connections on the Unix socket path"""
+    try:
+        _, writer = await asyncio.open_unix_connection(path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return False
+    writer.close()
+    await writer.wait_closed()
+    return True
+
+class _OutputRelay:
+    """File-like object forwarding everything written to a daemon caller"""
+    
+    def __init__(self, writer):
+        self.writer = writer
+    
+    def write(self, text):
+        if text:
+            self.writer.write(json.dumps({'out': text}).encode() + b'\n')
+        return len(text)
+    
+    def flush(self):
+        pass
+
+async def serve_daemon(client, path):
+    """Keep one Socket.IO session open and run tests requested over a Unix socket
+    
+    Each request is one JSON line: {"test", "url", "sndbuf", "options"}.
+    Requests for another server URL or buffer size are rejected; options
+    (DAEMON_OPTIONS) apply to that request only. Everything the test prints
+    is streamed back as {"out": text} lines, followed by a final
+    {"ok": bool} or {"error": message} line. Tests run one at a time.
+    """
+    error = _check_ipc_dir(path, create=True)
+    if error:
+        print(f"✗ Refusing to listen on {path}: {error}")
+        return 1
+    if await _daemon_listening(path):
+        print(f"✗ A test daemon is already listening on {path}")
+        return 1
+    _remove_ipc_socket(path)
+    
+    if not await client.connect_to_server():
+        print("Failed to connect")
+        return 1
+    
+    lock = asyncio.Lock()
+    # stdout is only swapped for the caller whose test holds the lock; the
+    # daemon's own log lines always go here so they never reach a caller
+    daemon_out = sys.stdout
+    
+    def reply(writer, message):
+        writer.write(json.dumps(message).encode() + b'\n')
+    
+    async def handle_request(reader, writer):
+        try:
+            try:
+                request = json.loads(await reader.readline())
+                name = request['test']
+                options = request.get('options', {})
+            except (ValueError, KeyError, TypeError):
+                reply(writer, {'error': 'malformed request'})
+                return
+            
+            if request.get('url') != client.server_url:
+                reply(writer, {'error': f"daemon is connected to {client.server_url}, "
+                                        f"not {request.get('url')}"})
+                return
+            if request.get('sndbuf') != client.sndbuf:
+                reply(writer, {'error': f"daemon uses --sndbuf {client.sndbuf}, "
+                                        f"not {request.get('sndbuf')}"})
+                return
+            unknown = set(options) - set(DAEMON_OPTIONS)
+            if unknown:
+                reply(writer, {'error': f"unsupported options: {', '.join(sorted(unknown))}"})
+                return
+            
+            print(f"Daemon running test: {name}", file=daemon_out)
+            daemon_out.flush()
+            async with lock:
+                saved = {key: getattr(client, key) for key in options}
+                try:
+                    for key, value in options.items():
+                        setattr(client, key, value)
+                    with contextlib.redirect_stdout(_OutputRelay(writer)):
+                        ok = await run_test(client, name)
+                except Exception as e:
+                    print(f"Daemon test {name} failed with error: {e}", file=daemon_out)
+                    reply(writer, {'error': f"test failed with error: {e}"})
+                    return
+                finally:
+                    for key, value in saved.items():
+                        setattr(client, key, value)
+            reply(writer, {'ok': bool(ok)})
+            await writer.drain()
+        except ConnectionError:
+            # The caller went away; nobody is left to reply to
+            pass
+        finally:
+            writer.close()
+            daemon_out.flush()
+    
+    server = await asyncio.start_unix_server(handle_request, path=path)
+    os.chmod(path, 0o600)
+    atexit.register(_remove_ipc_socket, path)
+    print(f"✓ Test daemon listening on {path}")
+    sys.stdout.flush()
     
     try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        _remove_ipc_socket(path)
+        await client.disconnect_from_server()
+
+async def run_via_daemon(path, args):
+    """Run args.test on a running --server-mode daemon, relaying its output
+    
+    Returns the test's success, or None if the daemon could not be used.
+    """
+    error = _check_ipc_dir(path)
+    if error:
+        print(f"✗ Refusing to use {path}: {error}")
+        return None
+    try:
+        reader, writer = await asyncio.open_unix_connection(path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"✗ No test daemon listening on {path}")
+        return None
+    
+    try:
+        request = {
+            'test': args.test,
+            'url': args.url,
+            'sndbuf': args.sndbuf,
+            'options': {key: getattr(args, key) for key in DAEMON_OPTIONS}
+        }
+        writer.write(json.dumps(request).encode() + b'\n')
+        await writer.drain()
+        
+        async for line in reader:
+            message = json.loads(line)
+            if 'out' in message:
+                sys.stdout.write(message['out'])
+            elif 'error' in message:
+                print(f"✗ Daemon rejected the request: {message['error']}")
+                return None
+            else:
+                return bool(message.get('ok'))
+        
+        print("✗ Daemon closed the connection before finishing the test")
+        return False
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+async def run(args):
+    """Run the requested test or interactive session on the event loop"""
+    if args.via_daemon:
+        # Reuse the session of a running daemon instead of connecting anew
+        ok = await run_via_daemon(args.ipc_path, args)
+        return 0 if ok else 1
+    
+    client = SocketIOTestClient(args.url, sndbuf=args.sndbuf,
+                                legacy_serial=args.legacy_serial, pace=args.pace,
+                                quiet=args.quiet, wait_for_response=args.wait_for_response)
+    
+    try:
+        if args.server_mode:
+            return await serve_daemon(client, args.ipc_path)
+        
         if args.interactive:
             print("Interactive Socket.IO Test Client")
-            print("Commands: connect, disconnect, ping, test, status, key <key>, sequence <keys>, quit")
+            print(f"Commands: {COMMANDS_HELP}")
             
             while True:
-                cmd = input(">> ").strip().split()
+                # Read off the loop so it keeps servicing the socket
+                line = await _read_line(">> ")
+                if line is None:
+                    break
+                try:
+                    cmd = shlex.split(line)
+                except ValueError as e:
+                    print(f"Invalid input: {e}")
+                    continue
                 if not cmd:
                     continue
                 
                 if cmd[0] == 'quit':
                     break
-                elif cmd[0] == 'connect':
-                    client.connect_to_server()
-                elif cmd[0] == 'disconnect':
-                    client.disconnect_from_server()
-                elif cmd[0] == 'ping':
-                    client.send_ping()
-                elif cmd[0] == 'test':
-                    client.test_connection()
-                elif cmd[0] == 'status':
-                    client.get_status()
-                elif cmd[0] == 'key' and len(cmd) > 1:
-                    key = cmd[1].lower()
-                    client.send_key(key, ord(key.upper()))
-                elif cmd[0] == 'sequence' and len(cmd) > 1:
-                    keys = cmd[1]
-                    client.send_key_sequence(keys)
-                else:
-                    print("Unknown command. Available: connect, disconnect, ping, test, status, key <key>, sequence <keys>, quit")
+                
+                handler = HANDLERS.get(cmd[0])
+                coro = handler(client, cmd[1:]) if handler else None
+                
+                if coro is None:
+                    if handler:
+                        print(f"Invalid arguments for {cmd[0]}; <key> is a single character. "
+                              f"Usage: {COMMANDS_HELP}")
+                    else:
+                        print(f"Unknown command. Available: {COMMANDS_HELP}")
+                    continue
+                await coro
+            
+            # quit or end of input; sends anything still queued
+            await client.disconnect_from_server()
         
         else:
             # Run specific test
-            if args.test == 'comprehensive':
-                success = client.run_comprehensive_test()
-            else:
-                if not client.connect_to_server():
-                    print("Failed to connect")
-                    return 1
-                
-                time.sleep(1)
-                
-                if args.test == 'ping':
-                    client.send_ping()
-                elif args.test == 'connection':
-                    success = client.test_connection()
-                elif args.test == 'status':
-                    success = client.get_status()
-                elif args.test == 'keys':
-                    client.send_key_sequence("wasd")
-                
-                client.disconnect_from_server()
+            if not await client.connect_to_server():
+                print("Failed to connect")
+                return 1
+            
+            ok = await run_test(client, args.test)
+            
+            await client.disconnect_from_server()
+            return 0 if ok else 1
         
         return 0
         
-    except KeyboardInterrupt:
-        print("\nTest interrupted by user")
-        client.disconnect_from_server()
-        return 1
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        # asyncio.run turns Ctrl-C into cancellation of this task; clean up
+        # and let main() report the interruption
+        await client.disconnect_from_server()
+        raise
     except Exception as e:
         print(f"Test failed with error: {e}")
-        client.disconnect_from_server()
+        await client.disconnect_from_server()
+        return 1
+
+def main():
+    parser = argparse.ArgumentParser(description='Socket.IO Test Client for bocchi robot controller')
+    parser.add_argument('--url', default='http://localhost:8080', 
+                       help='Socket.IO server URL (default: http://localhost:8080)')
+    parser.add_argument('--test', choices=list(TESTS),
+                       default='comprehensive', help='Test type to run')
+    parser.add_argument('--interactive', action='store_true',
+                       help='Run in interactive mode')
+    parser.add_argument('--sndbuf', type=int, default=0,
+                       help='Fixed socket send/receive buffer size in bytes '
+                            '(default: 0, kernel autotuning)')
+    parser.add_argument('--legacy-serial', action='store_true',
+                       help='Send the comprehensive test keys one at a time instead of pipelined')
+    parser.add_argument('--pace', type=float, default=0, metavar='SECONDS',
+                       help='Pause between comprehensive test steps (default: 0)')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Do not print every received response')
+    parser.add_argument('--wait-for-response', action='store_true',
+                       help='Wait for the pong/response to ping and individual key sends')
+    parser.add_argument('--server-mode', action='store_true',
+                       help='Stay connected and run tests requested by other invocations')
+    parser.add_argument('--via-daemon', action='store_true',
+                       help='Run --test on a running --server-mode daemon with the same --url')
+    parser.add_argument('--ipc-path', default=_default_ipc_path(),
+                       help='Unix socket of the --server-mode daemon '
+                            '(default: $XDG_RUNTIME_DIR/bocchi_socketio_client.sock)')
+    
+    args = parser.parse_args()
+    
+    # When output goes to a pipe or file, write it in blocks rather than one
+    # syscall per line (even under PYTHONUNBUFFERED); flushed on disconnect.
+    if not sys.stdout.isatty():
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    
+    try:
+        # libuv-backed event loop, cuts per-event overhead for small messages.
+        # Installed here rather than at import so importing this module does
+        # not change the event loop policy for other tests.
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    try:
+        return asyncio.run(run(args))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nTest interrupted by user")
         return 1
 
 if __name__ == "__main__":
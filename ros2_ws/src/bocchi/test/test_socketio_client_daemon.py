@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Tests for the --server-mode test daemon of the Socket.IO test client.
+Drives serve_daemon and run_via_daemon over a temporary Unix socket with a
+stub client, so no Socket.IO server is needed.
+"""
+
+import unittest
+import asyncio
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(__file__))
+try:
+    import test_socketio_client as sio_client
+except ImportError:
+    # python-socketio not installed
+    sio_client = None
+
+URL = 'http://localhost:8080'
+
+
+class StubClient:
+    """Stands in for SocketIOTestClient; the daemon only needs these members"""
+
+    def __init__(self):
+        self.server_url = URL
+        self.sndbuf = 0
+        self.legacy_serial = False
+        self.pace = 0
+        self.quiet = False
+        self.wait_for_response = False
+        self.connected = False
+
+    async def connect_to_server(self):
+        self.connected = True
+        return True
+
+    async def disconnect_from_server(self):
+        self.connected = False
+
+
+async def _echo(client):
+    print("hello from the test")
+    return True
+
+
+async def _boom(client):
+    raise RuntimeError("session dropped")
+
+
+async def _wait_for_path(path, timeout=2):
+    """Wait until the daemon has created its socket"""
+    for _ in range(int(timeout / 0.01)):
+        if os.path.exists(path):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{path} was not created")
+
+
+@unittest.skipIf(sio_client is None, "python-socketio not available")
+class TestCheckIpcDir(unittest.TestCase):
+    """Test the ownership/permission check on the daemon socket directory"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_private_directory_is_accepted(self):
+        os.chmod(self.tmp, 0o700)
+        self.assertIsNone(sio_client._check_ipc_dir(os.path.join(self.tmp, 'd.sock')))
+
+    def test_shared_directory_is_refused(self):
+        os.chmod(self.tmp, 0o755)
+        error = sio_client._check_ipc_dir(os.path.join(self.tmp, 'd.sock'))
+        self.assertIn('not accessible to others', error)
+
+    def test_missing_directory_is_accepted(self):
+        path = os.path.join(self.tmp, 'missing', 'd.sock')
+        self.assertIsNone(sio_client._check_ipc_dir(path))
+        self.assertFalse(os.path.exists(os.path.dirname(path)))
+
+    def test_create_makes_private_directory(self):
+        path = os.path.join(self.tmp, 'run', 'd.sock')
+        self.assertIsNone(sio_client._check_ipc_dir(path, create=True))
+        self.assertEqual(os.stat(os.path.dirname(path)).st_mode & 0o777, 0o700)
+
+
+@unittest.skipIf(sio_client is None, "python-socketio not available")
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Unix sockets not available")
+class TestServeDaemon(unittest.IsolatedAsyncioTestCase):
+    """Test the daemon's request validation and output relay"""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.path = os.path.join(self.tmp, 'd.sock')
+        self.client = StubClient()
+        self.seen = {}
+
+        async def record(client):
+            self.seen.update(quiet=client.quiet, pace=client.pace)
+            return False
+
+        tests = patch.dict(sio_client.TESTS, {'echo': _echo, 'boom': _boom, 'record': record})
+        tests.start()
+        self.addCleanup(tests.stop)
+
+        # The daemon logs to whatever stdout is when it starts
+        self.daemon_out = io.StringIO()
+        with contextlib.redirect_stdout(self.daemon_out):
+            self.daemon = asyncio.create_task(sio_client.serve_daemon(self.client, self.path))
+            await _wait_for_path(self.path)
+
+    async def asyncTearDown(self):
+        self.daemon.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.daemon
+
+    async def request(self, **fields):
+        """Send one request and return every reply line the daemon sends"""
+        message = {'test': 'echo', 'url': URL, 'sndbuf': 0, 'options': {}}
+        message.update(fields)
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+        replies = [json.loads(line) async for line in reader]
+        writer.close()
+        await writer.wait_closed()
+        return replies
+
+    async def test_socket_is_private(self):
+        self.assertTrue(self.client.connected)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    async def test_output_is_relayed_before_result(self):
+        replies = await self.request()
+        self.assertEqual(replies[-1], {'ok': True})
+        output = ''.join(reply['out'] for reply in replies[:-1])
+        self.assertIn("hello from the test\n", output)
+        self.assertIn("echo: ", output)
+        # The daemon's own log line stays on the daemon
+        self.assertNotIn("Daemon running test", output)
+        self.assertIn("Daemon running test: echo", self.daemon_out.getvalue())
+
+    async def test_other_url_is_rejected(self):
+        replies = await self.request(url='http://otherhost:8080')
+        self.assertEqual(len(replies), 1)
+        self.assertIn('not http://otherhost:8080', replies[0]['error'])
+
+    async def test_other_sndbuf_is_rejected(self):
+        replies = await self.request(sndbuf=65536)
+        self.assertEqual(len(replies), 1)
+        self.assertIn('--sndbuf', replies[0]['error'])
+
+    async def test_unknown_option_is_rejected(self):
+        replies = await self.request(options={'server_url': 'http://otherhost:8080'})
+        self.assertEqual(replies, [{'error': 'unsupported options: server_url'}])
+        self.assertEqual(self.client.server_url, URL)
+
+    async def test_malformed_request_is_rejected(self):
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        writer.write(b'not json\n')
+        await writer.drain()
+        replies = [json.loads(line) async for line in reader]
+        writer.close()
+        await writer.wait_closed()
+        self.assertEqual(replies, [{'error': 'malformed request'}])
+
+    async def test_options_apply_to_one_request(self):
+        replies = await self.request(test='record', options={'quiet': True, 'pace': 0.5})
+        self.assertEqual(replies[-1], {'ok': False})
+        self.assertEqual(self.seen, {'quiet': True, 'pace': 0.5})
+        self.assertFalse(self.client.quiet)
+        self.assertEqual(self.client.pace, 0)
+
+    async def test_failing_test_is_reported(self):
+        replies = await self.request(test='boom', options={'quiet': True})
+        self.assertIn('session dropped', replies[-1]['error'])
+        self.assertFalse(self.client.quiet)
+        # The daemon keeps serving afterwards
+        self.assertEqual((await self.request())[-1], {'ok': True})
+
+
+@unittest.skipIf(sio_client is None, "python-socketio not available")
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Unix sockets not available")
+class TestRunViaDaemon(unittest.IsolatedAsyncioTestCase):
+    """Test the caller side against a fake daemon with canned replies"""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.path = os.path.join(self.tmp, 'd.sock')
+        self.args = argparse.Namespace(test='status', url=URL, sndbuf=0,
+                                       legacy_serial=False, pace=0, quiet=True,
+                                       wait_for_response=False)
+
+    async def serve(self, replies):
+        """Start a fake daemon sending replies; returns the list of requests it got"""
+        requests = []
+
+        async def handle(reader, writer):
+            requests.append(json.loads(await reader.readline()))
+            for reply in replies:
+                writer.write(json.dumps(reply).encode() + b'\n')
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_unix_server(handle, path=self.path)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        return requests
+
+    async def call(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            ok = await sio_client.run_via_daemon(self.path, self.args)
+        return ok, out.getvalue()
+
+    async def test_request_and_relayed_output(self):
+        requests = await self.serve([{'out': 'line one\n'}, {'out': 'line two\n'}, {'ok': True}])
+        ok, output = await self.call()
+        self.assertTrue(ok)
+        self.assertEqual(output, 'line one\nline two\n')
+        self.assertEqual(requests, [{
+            'test': 'status',
+            'url': URL,
+            'sndbuf': 0,
+            'options': {'legacy_serial': False, 'pace': 0, 'quiet': True,
+                        'wait_for_response': False}
+        }])
+
+    async def test_failed_test(self):
+        await self.serve([{'ok': False}])
+        ok, _ = await self.call()
+        self.assertFalse(ok)
+
+    async def test_rejection(self):
+        await self.serve([{'error': 'daemon is connected to elsewhere'}])
+        ok, output = await self.call()
+        self.assertIsNone(ok)
+        self.assertIn('Daemon rejected the request: daemon is connected to elsewhere', output)
+
+    async def test_connection_closed_early(self):
+        await self.serve([{'out': 'partial\n'}])
+        ok, output = await self.call()
+        self.assertFalse(ok)
+        self.assertIn('closed the connection', output)
+
+    async def test_no_daemon(self):
+        ok, output = await self.call()
+        self.assertIsNone(ok)
+        self.assertIn('No test daemon listening', output)
+
+    async def test_shared_directory_is_refused(self):
+        os.chmod(self.tmp, 0o777)
+        ok, output = await self.call()
+        self.assertIsNone(ok)
+        self.assertIn('Refusing to use', output)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for response handling in the Socket.IO test client.
+Calls the catch-all handler directly with emit mocked, so no server is needed.
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock
+
+sys.path.insert(0, os.path.dirname(__file__))
+try:
+    import test_socketio_client as sio_client
+except ImportError:
+    # python-socketio not installed
+    sio_client = None
+
+
+@unittest.skipIf(sio_client is None, "python-socketio not available")
+class TestCatchAllResponses(unittest.IsolatedAsyncioTestCase):
+    """Test that *_response events resolve the request waiting on them"""
+
+    async def asyncSetUp(self):
+        self.client = sio_client.SocketIOTestClient(quiet=True)
+        self.client.sio.emit = AsyncMock()
+
+    async def test_response_resolves_matching_future(self):
+        response = {'request_id': 7, 'success': True}
+        self.client.sio.emit.side_effect = (
+            lambda event, payload: self.client._any('status_response', response))
+
+        result = await self.client._emit_and_wait('get_status', {'request_id': 7}, timeout=1)
+
+        self.assertIs(result, response)
+        self.client.sio.emit.assert_awaited_once_with('get_status', {'request_id': 7})
+        self.assertEqual(self.client._futures, {})
+
+    async def test_extra_arguments_are_ignored(self):
+        response = {'request_id': 3, 'success': True}
+        self.client.sio.emit.side_effect = (
+            lambda event, payload: self.client._any('key_press_response', response, 'extra'))
+
+        result = await self.client._emit_and_wait('key_press', {'request_id': 3}, timeout=1)
+
+        self.assertIs(result, response)
+
+    async def test_other_events_are_ignored(self):
+        fut = asyncio.get_running_loop().create_future()
+        self.client._futures[1] = fut
+
+        self.client._any('welcome', {'request_id': 1, 'success': True})
+        self.client._any('status_response')
+        self.client._any('status_response', {'request_id': 2, 'success': True})
+
+        self.assertFalse(fut.done())
+        self.assertIs(self.client._futures[1], fut)
+
+    async def test_future_removed_on_timeout(self):
+        result = await self.client._emit_and_wait('get_status', {'request_id': 5}, timeout=0.01)
+
+        self.assertIsNone(result)
+        self.assertEqual(self.client._futures, {})
+
+    async def test_late_response_is_harmless(self):
+        await self.client._emit_and_wait('get_status', {'request_id': 5}, timeout=0.01)
+
+        # Arrives after the caller gave up; nothing is waiting any more
+        self.client._any('status_response', {'request_id': 5, 'success': True})
+        self.assertEqual(self.client._futures, {})
+
+
+@unittest.skipIf(sio_client is None, "python-socketio not available")
+class TestFireAndForgetDelivery(unittest.IsolatedAsyncioTestCase):
+    """Test that events sent without waiting still reach the server"""
+
+    async def asyncSetUp(self):
+        self.client = sio_client.SocketIOTestClient(quiet=True)
+        self.client.sio.emit = AsyncMock()
+
+    async def test_disconnect_waits_for_queued_packets(self):
+        queue = asyncio.Queue()
+        queue.put_nowait('packet')
+        self.client.sio.eio.queue = queue
+        self.client.connected = True
+        pending_at_disconnect = []
+        self.client.sio.disconnect = AsyncMock(
+            side_effect=lambda: pending_at_disconnect.append(queue.qsize()))
+
+        async def write_loop():
+            await asyncio.sleep(0.01)
+            await queue.get()
+            queue.task_done()
+
+        writer = asyncio.create_task(write_loop())
+        await self.client.disconnect_from_server()
+        await writer
+
+        self.assertEqual(pending_at_disconnect, [0])
+
+    async def test_ping_test_waits_for_pong(self):
+        self.assertFalse(self.client.wait_for_response)
+        pong = self.client.sio.handlers['/']['pong']
+        self.client.sio.emit.side_effect = lambda event, payload: pong({'timestamp': 1})
+
+        self.assertTrue(await sio_client.TESTS['ping'](self.client))
+        self.client.sio.emit.assert_awaited_once()
+
+    async def test_ping_fails_without_pong(self):
+        self.assertFalse(await self.client.send_ping(timeout=0.01, wait=True))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
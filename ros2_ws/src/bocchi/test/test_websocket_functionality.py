@@ -11,7 +11,7 @@ import json
 import time
 import threading
 import socket
-from unittest.mock import Mock, patch, MagicMock, AsyncMock
+from unittest.mock import Mock, patch, MagicMock, AsyncMock, call
 import sys
 import os
 from concurrent.futures import ThreadPoolExecutor
@@ -58,6 +58,12 @@ except ImportError:
         class MinimalPublisher:
             pass
 
+# Socket.IO handlers can only be exercised with the real publisher module
+try:
+    from bocchi.publisher import MinimalPublisher as SocketIOPublisher, MAX_KEY_PRESS_HOLD_MS
+except ImportError:
+    SocketIOPublisher = None
+
 
 class TestWebSocketManager(unittest.TestCase):
     """Test WebSocket manager core functionality"""
@@ -408,6 +414,72 @@ class TestWebSocketIntegration(unittest.TestCase):
         self.assertEqual(call_args[1]['target'], self.api._schedule_broadcast)
 
 
+@unittest.skipIf(SocketIOPublisher is None, "bocchi.publisher not importable")
+class TestSocketIOKeyPress(unittest.TestCase):
+    """Test the key_press Socket.IO handler with a mocked publisher node"""
+    
+    def setUp(self):
+        """Set up a mock node whose key handling calls are recorded in order"""
+        self.calls = Mock()
+        self.calls.update_key.return_value = True
+        self.node = Mock()
+        self.node.api_handler.key_state_manager.update_key = self.calls.update_key
+        self.node.process_key_input = self.calls.process_key_input
+        self.node.process_key_release = self.calls.process_key_release
+        self.node.sio.sleep = self.calls.sleep
+        
+    def press(self, data):
+        """Invoke the handler and return the emitted response"""
+        SocketIOPublisher.handle_socketio_key_press(self.node, 'sid-1', data)
+        self.node.sio.emit.assert_called_once()
+        event, response = self.node.sio.emit.call_args[0]
+        self.assertEqual(event, 'key_press_response')
+        self.assertEqual(self.node.sio.emit.call_args[1], {'to': 'sid-1'})
+        return response
+        
+    def test_key_press_down_then_up(self):
+        """Test key_press presses and then releases the key"""
+        response = self.press({'key': 'w', 'key_code': 87})
+        
+        self.assertTrue(response['success'])
+        self.assertEqual(self.calls.mock_calls, [
+            call.update_key(87, True),
+            call.process_key_input('w', 87),
+            call.update_key(87, False),
+            call.process_key_release('w', 87),
+        ])
+        
+    def test_key_press_echoes_request_id(self):
+        """Test key_press response carries the request_id"""
+        response = self.press({'key': 'a', 'key_code': 65, 'request_id': 42})
+        
+        self.assertTrue(response['success'])
+        self.assertEqual(response['request_id'], 42)
+        
+    def test_key_press_hold_is_clamped(self):
+        """Test hold_ms is bounded and non-numeric values are ignored"""
+        self.press({'key': 'w', 'key_code': 87, 'hold_ms': 60000})
+        self.calls.sleep.assert_called_once_with(MAX_KEY_PRESS_HOLD_MS / 1000.0)
+        
+        self.calls.reset_mock()
+        self.node.sio.emit.reset_mock()
+        response = self.press({'key': 'w', 'key_code': 87, 'hold_ms': 'forever'})
+        self.calls.sleep.assert_not_called()
+        self.assertEqual(response['hold_ms'], 0)
+        
+    def test_key_press_error_path(self):
+        """Test key_press reports failure when no API handler is available"""
+        self.node.api_handler = None
+        self.node.flask_app = None
+        
+        response = self.press({'key': 'w', 'key_code': 87, 'request_id': 7})
+        
+        self.assertFalse(response['success'])
+        self.assertIn('error', response)
+        self.assertEqual(response['request_id'], 7)
+        self.calls.process_key_input.assert_not_called()
+
+
 class TestWebSocketServerLifecycle(unittest.TestCase):
     """Test WebSocket server lifecycle management"""
     
@@ -758,6 +830,7 @@ if __name__ == '__main__':
         TestWebSocketBroadcasting,
         TestWebSocketMessageFormats,
         TestWebSocketIntegration,
+        TestSocketIOKeyPress,
         TestWebSocketServerLifecycle,
         TestWebSocketConnectionHandling,
         TestWebSocketPerformance,